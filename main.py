@@ -1,395 +1,531 @@
-import importlib.util
-import subprocess
-
-# Check if a library is installed
-def library_installed(library_name):
-    spec = importlib.util.find_spec(library_name)
-    return spec is not None
-
-
-# Install a library using pip
-def install_library(library_name):
-    if library_name == "dateutil":
-        library_name = "python-dateutil"
-    subprocess.check_call(['pip', 'install', library_name])
-
-
-# List of required libraries
-required_libraries = ["os", "re", "datetime", "requests", "locale", "icalendar",
-                      "reportlab", "dateutil", "random", "pytz"]
-
-# Check and install missing libraries
-missing_libraries = []
-for library in required_libraries:
-    if not library_installed(library):
-        missing_libraries.append(library)
-
-if missing_libraries:
-    print("Installing missing libraries...")
-    for library in missing_libraries:
-        install_library(library)
-
-# Import the installed libraries
-import os
-import re
-import datetime
-import requests
-import locale
-import random
-import pytz
-from icalendar import Calendar
-from reportlab.lib.pagesizes import landscape, A4
-from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib.units import cm, mm
-from reportlab.platypus.flowables import KeepInFrame
-from dateutil.rrule import rrulestr
-
-# Output directory and name
-
-current_directory = os.getcwd()
-current_week = datetime.datetime.now().strftime('%Y-%W')
-
-# List of colors that are not set
-tmp_colors = {}
-
-for t in range(2):
-
-    # Define the output directory and filename
-    if t == 0:
-        try:
-            locale.setlocale(locale.LC_TIME, 'de_DE.utf8')
-        except locale.Error:
-            print("Unsupported locale setting, using default locale.")
-        output_filename = f'event_overview_{current_week}_de.pdf'
-    else:
-        try:
-            locale.setlocale(locale.LC_TIME, 'en_US.utf8')
-        except locale.Error:
-            print("Unsupported locale setting, using default locale.")
-        output_filename = f'event_overview_{current_week}_en.pdf'
-
-    output_path = os.path.join(current_directory, output_filename)
-
-    # Check if the output file already exists
-    if os.path.exists(output_path):
-        suffix = 1
-        base_name, extension = os.path.splitext(output_filename)
-
-        # Generate a new filename with an ascending suffix
-        while os.path.exists(output_path):
-            new_filename = f"{base_name}({suffix}){extension}"
-            output_path = os.path.join(current_directory, new_filename)
-            suffix += 1
-
-    rowamount = 0
-
-    # Fetch data from the iCal URL
-    ical_url = 'https://calendar.google.com/calendar/ical/queerreferat.aachen%40gmail.com/public/basic.ics'
-    response = requests.get(ical_url)
-    if response.status_code != 200:
-        print('Failed to fetch iCal data.')
-        exit()
-
-    # Set your local timezone
-    local_timezone = pytz.timezone('Europe/Berlin')
-
-    # Parse iCal data
-    calendar = Calendar.from_ical(response.text)
-
-    events_of_week = []
-    # Get the events of the current week
-    current_date = datetime.datetime.now().date()
-    start_of_week = current_date - datetime.timedelta(days=current_date.weekday())
-    end_of_week = start_of_week + datetime.timedelta(days=6)
-
-    # Iterate over the events in the calendar
-    for event in calendar.walk():
-        if event.name == 'VEVENT':
-            # Regular event
-            event_start = event.decoded('DTSTART')
-            if isinstance(event_start, datetime.datetime):
-                event_start = event_start.date()
-            event_end = event.decoded('DTEND')
-            if isinstance(event_end, datetime.datetime):
-                event_end = event_end.date()
-
-            if start_of_week <= event_start <= end_of_week or start_of_week <= event_end <= end_of_week:
-                events_of_week.append(event)
-
-            # Recurring event
-            if event.get('RRULE'):
-                rrule = event['RRULE'].to_ical().decode('utf-8')
-
-                recurring_events = []
-
-                # Create the recurrence rule object from the RRULE string
-                rule = rrulestr(rrule, dtstart=event_start, ignoretz=True)
-
-                # Convert start_of_week and end_of_week to datetime.datetime objects
-                start_of_week_datetime = datetime.datetime.combine(start_of_week, datetime.datetime.min.time())
-                end_of_week_datetime = datetime.datetime.combine(end_of_week, datetime.datetime.max.time())
-
-                # Generate the recurring dates within the specified week
-                recurring_dates = rule.between(start_of_week_datetime, end_of_week_datetime, inc=True)
-
-                for date in recurring_dates:
-                    new_event = event.copy()
-
-                    event_start_time = event.decoded('DTSTART')
-                    if isinstance(event_start_time, datetime.datetime):
-                        event_start_time = event_start_time.time()
-                    event_end_time = event.decoded('DTEND')
-                    if isinstance(event_end_time, datetime.datetime):
-                        event_end_time = event_end_time.time()
-
-                    # Calculate the adjusted start and end times based on the original event's duration
-                    new_event_start = datetime.datetime.combine(date, event_start_time)
-                    new_event_end = datetime.datetime.combine(date, event_end_time)
-
-                    new_event['DTSTART'].dt = new_event_start
-                    new_event['DTEND'].dt = new_event_end
-
-                    # Convert UNTIL value to UTC if it is timezone-aware
-                    if 'RRULE' in new_event and 'UNTIL' in new_event['RRULE']:
-                        until_value = new_event['RRULE']['UNTIL']
-                        if isinstance(until_value, list):
-                            until_value = until_value[0]
-                        if until_value.tzinfo is not None:
-                            until_value = until_value.astimezone(pytz.UTC)
-                            new_event['RRULE']['UNTIL'] = [until_value]
-
-                    recurring_events.append(new_event)
-
-                events_of_week.extend(recurring_events)
-
-    # Prepare column Headers
-    header = []
-    dates = [start_of_week + datetime.timedelta(days=i) for i in range(7)]
-    header.extend(date.strftime('%A\n%d %b') for date in dates)
-    data = [header]
-
-    # Location Filter
-    location_variable = 'Queerreferat an den Aachener Hochschulen e.V., Gerlachstraße 20-22, 52064 Aachen, Deutschland'
-
-    # Create a dictionary to store events by date
-    events_by_date = {date: [] for date in dates}
-
-    # Filtering duplicate events:
-    filtered_events = []
-    processed_event_uids = set()
-
-    for event in events_of_week:
-        event_uid = event.get('UID')
-
-        if event_uid not in processed_event_uids:
-            filtered_events.append(event)
-            processed_event_uids.add(event_uid)
-        else:
-            existing_event_index = next(
-                (index for index, e in enumerate(filtered_events) if e.get('UID') == event_uid), None
-            )
-
-            if existing_event_index is not None:
-                existing_event = filtered_events[existing_event_index]
-
-                if event.decoded('LAST-MODIFIED') > existing_event.decoded('LAST-MODIFIED'):
-                    filtered_events[existing_event_index] = event
-
-    events_of_week = filtered_events
-
-    # Group events by date
-    for event in events_of_week:
-        event_start = event.decoded('DTSTART')
-        if isinstance(event_start, datetime.datetime):
-            event_start = event_start.date()
-        # Filter events if needed
-        if event.decoded('SUMMARY') != bytes('', 'utf-8'):
-            events_by_date[event_start].append(event)
-
-    events_exist = True
-    # Find highest amount of events
-    maxevents = 0
-    for date in dates:
-        if len(events_by_date[date]) > maxevents:
-            maxevents = len(events_by_date[date])
-    rowamount = maxevents
-    if maxevents < 1:
-        events_exist = False
-
-    columnwidth = 110
-
-    # Create columns for the table
-    for j in range(rowamount):
-        data.append(['', '', '', '', '', '', ''])
-
-    for date in dates:
-        events = events_by_date[date]
-        k = 1
-
-        events = sorted(events, key=lambda e: e.decoded('DTSTART').astimezone(local_timezone))
-        sorted_events = []
-        for (index, ev) in enumerate(events):
-            if ev in sorted_events:
-                continue
-            if index != len(events) - 1 and ev.decoded('DTSTART').astimezone(local_timezone) == events[
-                index + 1].decoded('DTSTART').astimezone(local_timezone) and ev.get("SUMMARY") > events[index + 1].get(
-                    "SUMMARY"):
-                sorted_events.append(events[index + 1])
-                sorted_events.append(ev)
-            else:
-                sorted_events.append(ev)
-
-        for event in sorted_events:
-            # Format event information
-            event_title = event.get('SUMMARY')
-            event_time = f"{event.decoded('DTSTART').astimezone(local_timezone).strftime('%H:%M')} - {event.decoded('DTEND').astimezone(local_timezone).strftime('%H:%M')}"
-            event_location = "<br/>" + event.get('LOCATION', '') if event.get('LOCATION',
-                                                                              '') != location_variable else ''
-            event_description = re.sub(r'<(?!br/).*?>', '', event.get('DESCRIPTION', ''))
-            if t == 0:
-                if "----" in event_description:
-                    event_description = event_description.split("----")[0]
-                elif "_______________" in event_description:
-                    event_description = event_description.split("_______________")[0]
-                elif "______________" in event_description:
-                    event_description = event_description.split("______________")[0]
-            else:
-                if "----" in event_description:
-                    event_description = event_description.split("----")[1]
-                elif "_______________" in event_description:
-                    event_description = event_description.split("_______________")[1]
-                elif "______________" in event_description:
-                    event_description = event_description.split("______________")[1]
-
-            styles = getSampleStyleSheet()
-            cell_style = styles["BodyText"]
-            cell_style.fontSize = 12
-
-            # Collect event infos
-            cell_contents = f"<b>{event_title}</b><br/>{event_time}<i>{event_location}</i><br/>{event_description}"
-            cell_content = Paragraph(cell_contents, cell_style)
-
-            event_start = event.decoded('DTSTART')
-            if isinstance(event_start, datetime.datetime):
-                event_start = event_start.date()
-
-            data[k][(event_start - start_of_week).days] = cell_content
-
-            k = k + 1
-
-    # Create table style
-    table_style = [
-        ('BACKGROUND', (0, 0), (-1, 0), colors.white),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 14),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 2),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('SPAN', (0, 1), (0, 2))
-    ]
-
-    # Define event name to color mapping
-    event_color_mapping = {
-        'Filmabend': colors.HexColor("#E78080"),
-        'Queer Feminist Action': colors.HexColor("#88E780"),
-        'Queercafé': colors.HexColor("#E780DB"),
-        'Trans-Beratung': colors.HexColor("#80E7E1"),
-        'test²multiply': colors.HexColor("#F6A97C"),
-        'International Evening': colors.HexColor("#80E7A7"),
-        'Ace & Aro Abend': colors.HexColor("#E7E680"),
-        'Fesseltreff': colors.HexColor("#AA80E7"),
-        'Bi-Pan* and Friends': colors.HexColor("#E7C280"),
-        'FLINTA-Abend': colors.HexColor("#DF80E7"),
-        'Plenum': colors.HexColor("#8081E7"),
-        'Spieleabend': colors.HexColor("#E7D080"),
-        'TIN* Abend': colors.HexColor("#84D980"),
-        'Poly Abend': colors.HexColor("#D2D984"),
-        'Warm Up': colors.HexColor("#F05252"),
-        'Anime Abend (Film)': colors.HexColor("#f2966f"),
-        'Anime Abend Serie': colors.HexColor("#BDF370"),
-        'Bibliothekstreffen': colors.HexColor("#99FFFC"),
-
-        # Add more event names and corresponding colors as key-value pairs
-    }
-
-    spanned_cell_color = None  # Initialize spanned_cell_color variable
-    # Add merged cell coordinates to table style
-    for row_index, row in enumerate(data):
-        for col_index, cell in enumerate(row):
-            # Extract the actual cell content from the KeepInFrame object
-            # cell_content = cell._content[0] if isinstance(cell, KeepInFrame) else cell
-            cell_content = cell
-            # Extract the first line (bolded) from the cell contents
-            cell_content_lines = re.findall(r"<b>(.*?)</b>", str(cell_content))
-            event_name = cell_content_lines[0].strip() if cell_content_lines else ''
-
-            if event_name not in event_color_mapping and event_name not in tmp_colors:
-                tmp_colors[event_name] = (random.uniform(0.7, 1), random.uniform(0.7, 1), random.uniform(0.7, 1))
-
-            rowheights = 470 / rowamount
-            color_to_use = event_color_mapping.get(event_name) if event_color_mapping.get(
-                event_name) else tmp_colors.get(event_name)
-            if row_index > 0 and row_index < rowamount:
-                if data[row_index][col_index] != '':
-                    table_style.append(('BACKGROUND', (col_index, row_index), (col_index, row_index), color_to_use))
-                if data[row_index + 1][col_index] == '':
-                    if row_index + 2 <= rowamount and data[row_index + 2][col_index] == '':
-                        table_style.append(('SPAN', (col_index, row_index), (col_index, row_index + 2)))
-                        rowheights = 3 * rowheights
-                        if data[row_index][col_index] != '':
-                            table_style.append(
-                                ('BACKGROUND', (col_index, row_index), (col_index, row_index + 2), color_to_use))
-                    else:
-                        table_style.append(('SPAN', (col_index, row_index), (col_index, row_index + 1)))
-                        rowheights = 2 * rowheights
-                        if data[row_index][col_index] != '':
-                            table_style.append(
-                                ('BACKGROUND', (col_index, row_index), (col_index, row_index + 1), color_to_use))
-
-            elif row_index == rowamount and data[row_index][col_index] != '':
-                table_style.append(('BACKGROUND', (col_index, row_index), (col_index, row_index), color_to_use))
-
-            if type(cell_content) == Paragraph:
-                cell_content = KeepInFrame(columnwidth, rowheights, [cell_content])
-                data[row_index][col_index] = cell_content
-
-    elements = []
-
-    # Add title
-    title_style = getSampleStyleSheet()["Title"]
-    if t == 0:
-        title_text = f"Veranstaltungen der Woche vom {start_of_week.strftime('%d %b %Y')} bis {end_of_week.strftime('%d %b %Y')}"
-    else:
-        title_text = f"<i>Events of the week from {start_of_week.strftime('%d %b %Y')} to {end_of_week.strftime('%d %b %Y')}</i>"
-
-    title = Paragraph(title_text, title_style)
-    elements.append(title)
-
-    # Create table
-    if events_exist:
-        # Calculate cell heights based on content
-        row_heights = [cm * 1.5] + [rowheights] * rowamount
-        table = Table(data, colWidths=columnwidth, rowHeights=row_heights)
-        table.setStyle(TableStyle(table_style))
-        elements.append(table)
-    else:
-        msg_style = getSampleStyleSheet()["Heading1"]
-        msg_text = "Diese Woche keine Veranstaltungen<br/><i>No events this week</i>"
-        msg = Paragraph(msg_text, msg_style)
-        elements.append(Spacer(1, 2 * cm))
-        elements.append(msg)
-
-    # Create the PDF file
-    doc = SimpleDocTemplate(output_path, pagesize=landscape(A4), leftMargin=(6.35 * mm), rightMargin=(6.35 * mm),
-                            topMargin=(6.35 * mm),
-                            bottomMargin=(6.35 * mm))
-
-    # Build the document with the elements
-    doc.build(elements)
-
-    print(f'Event overview table generated: {output_path}')
+import importlib.util
+import subprocess
+import sys
+
+# Check if a library is installed
+def library_installed(library_name):
+    spec = importlib.util.find_spec(library_name)
+    return spec is not None
+
+
+# Install a library using pip
+def install_library(library_name):
+    if library_name == "dateutil":
+        library_name = "python-dateutil"
+    subprocess.check_call(['pip', 'install', library_name])
+
+
+# List of required third-party libraries
+required_libraries = ["requests", "icalendar", "reportlab", "dateutil"]
+
+# Check and install missing libraries (only when explicitly requested)
+if "--bootstrap" in sys.argv:
+    missing_libraries = []
+    for library in required_libraries:
+        if not library_installed(library):
+            missing_libraries.append(library)
+
+    if missing_libraries:
+        print("Installing missing libraries...")
+        for library in missing_libraries:
+            install_library(library)
+
+# Import the installed libraries
+import os
+import re
+import json
+import zlib
+import datetime
+import requests
+from requests.adapters import HTTPAdapter
+import locale
+from icalendar import Calendar
+from zoneinfo import ZoneInfo
+from reportlab.lib.pagesizes import landscape, A4
+from reportlab.lib import colors
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import cm, mm
+from reportlab.platypus.flowables import KeepInFrame
+from dateutil.rrule import rrulestr
+from functools import lru_cache
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+# Local timezone for event display
+LOCAL_TIMEZONE = ZoneInfo('Europe/Berlin')
+
+# Shared reportlab styles, built once instead of per event
+STYLES = getSampleStyleSheet()
+CELL_STYLE = ParagraphStyle('Cell', parent=STYLES['BodyText'], fontSize=12)
+TITLE_STYLE = STYLES['Title']
+MSG_STYLE = STYLES['Heading1']
+
+# Strip HTML tags (except <br/>) from event descriptions
+HTML_STRIP_RE = re.compile(r'<(?!br\s*/?>)[^>]*>')
+
+# Separator between the German and English halves of a description
+SEPARATOR_RE = re.compile(r'(?:----|_{14,15})')
+
+# Define event name to color mapping
+EVENT_COLOR_HEX = {
+    'Filmabend': "#E78080",
+    'Queer Feminist Action': "#88E780",
+    'Queercafé': "#E780DB",
+    'Trans-Beratung': "#80E7E1",
+    'test²multiply': "#F6A97C",
+    'International Evening': "#80E7A7",
+    'Ace & Aro Abend': "#E7E680",
+    'Fesseltreff': "#AA80E7",
+    'Bi-Pan* and Friends': "#E7C280",
+    'FLINTA-Abend': "#DF80E7",
+    'Plenum': "#8081E7",
+    'Spieleabend': "#E7D080",
+    'TIN* Abend': "#84D980",
+    'Poly Abend': "#D2D984",
+    'Warm Up': "#F05252",
+    'Anime Abend (Film)': "#f2966f",
+    'Anime Abend Serie': "#BDF370",
+    'Bibliothekstreffen': "#99FFFC",
+
+    # Add more event names and corresponding colors as key-value pairs
+}
+EVENT_COLORS = {name: colors.HexColor(value) for name, value in EVENT_COLOR_HEX.items()}
+
+# Style directives shared by every document; copied per table so the
+# per-run span/background appends never leak between documents
+BASE_TABLE_STYLE = (
+    ('BACKGROUND', (0, 0), (-1, 0), colors.white),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 14),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 2),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('SPAN', (0, 1), (0, 2)),
+)
+
+# Pastel fallback palette for event names without a fixed color
+FALLBACK_PALETTE = [colors.HexColor(value) for value in (
+    "#FFD6E0", "#D6FFE0", "#D6E0FF", "#FFF3D6", "#E0D6FF", "#D6FFF6",
+    "#FFE0D6", "#EAFFD6", "#D6F2FF", "#FFD6F6", "#F6FFD6", "#D6DBFF",
+    "#FFEBD6", "#DCFFD6", "#D6FFEE", "#F2D6FF",
+)]
+
+
+# Deterministically pick a fallback color for an unknown event name
+def color_for(event_name):
+    return FALLBACK_PALETTE[zlib.crc32(event_name.encode('utf-8')) % len(FALLBACK_PALETTE)]
+
+# Shared HTTP session and cache for conditional GETs on the iCal feed
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=10))
+SESSION.headers['Accept-Encoding'] = 'gzip'
+_ical_etag = None
+_ical_lastmod = None
+_ical_cached_calendar = None
+
+# On-disk cache so cron-style re-runs in fresh processes can still get 304s
+ICAL_CACHE_META = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.ical_cache.json')
+ICAL_CACHE_BODY = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.ical_cache.ics')
+
+
+# Load the cached validators and body from the previous run, if any
+def _load_ical_cache():
+    global _ical_etag, _ical_lastmod
+    try:
+        with open(ICAL_CACHE_META) as meta_file:
+            meta = json.load(meta_file)
+        _ical_etag = meta.get('etag')
+        _ical_lastmod = meta.get('last_modified')
+    except (OSError, ValueError):
+        pass
+
+
+# Persist the validators and body for the next run
+def _store_ical_cache(etag, lastmod, body):
+    try:
+        with open(ICAL_CACHE_BODY, 'wb') as body_file:
+            body_file.write(body)
+        with open(ICAL_CACHE_META, 'w') as meta_file:
+            json.dump({'etag': etag, 'last_modified': lastmod}, meta_file)
+    except OSError:
+        pass
+
+
+# Fetch and parse the iCal feed, reusing the cached calendar on 304 Not Modified
+def fetch_calendar(ical_url):
+    global _ical_etag, _ical_lastmod, _ical_cached_calendar
+    if _ical_etag is None and _ical_lastmod is None:
+        _load_ical_cache()
+    headers = {}
+    if _ical_etag is not None:
+        headers['If-None-Match'] = _ical_etag
+    if _ical_lastmod is not None:
+        headers['If-Modified-Since'] = _ical_lastmod
+    with SESSION.get(ical_url, headers=headers, stream=True, timeout=(5, 30)) as response:
+        if response.status_code == 304:
+            if _ical_cached_calendar is None:
+                try:
+                    with open(ICAL_CACHE_BODY, 'rb') as body_file:
+                        _ical_cached_calendar = Calendar.from_ical(body_file.read())
+                except (OSError, ValueError):
+                    return None
+            return _ical_cached_calendar
+        if response.status_code != 200:
+            return None
+        _ical_etag = response.headers.get('ETag')
+        _ical_lastmod = response.headers.get('Last-Modified')
+        # from_ical accepts bytes, so skip the response.text decode round-trip
+        body = response.content
+        _ical_cached_calendar = Calendar.from_ical(body)
+        _store_ical_cache(_ical_etag, _ical_lastmod, body)
+    return _ical_cached_calendar
+
+
+# Per-event time data, decoded once when the event is first touched
+EventTimes = namedtuple('EventTimes', ['start_date', 'end_date', 'start_local', 'end_local', 'vevent'])
+
+
+# Decode an event's start/end into dates and local-time datetimes
+def make_event_times(vevent, start, end):
+    if isinstance(start, datetime.datetime):
+        start_date = start.date()
+        start_local = start.astimezone(LOCAL_TIMEZONE)
+    else:
+        start_date = start
+        start_local = datetime.datetime.combine(start, datetime.time.min)
+    if isinstance(end, datetime.datetime):
+        end_date = end.date()
+        end_local = end.astimezone(LOCAL_TIMEZONE)
+    else:
+        end_date = end
+        end_local = datetime.datetime.combine(end, datetime.time.min)
+    return EventTimes(start_date, end_date, start_local, end_local, vevent)
+
+
+# Compile an RRULE string once per (rule, start date) pair
+@lru_cache(maxsize=512)
+def compile_rrule(rrule_str, dtstart_ordinal):
+    return rrulestr(rrule_str, dtstart=datetime.date.fromordinal(dtstart_ordinal), ignoretz=True)
+
+
+# Collect the events of the current week, grouped by date
+def collect_events(calendar, current_date):
+    start_of_week = current_date - datetime.timedelta(days=current_date.weekday())
+    end_of_week = start_of_week + datetime.timedelta(days=6)
+
+    events_of_week = []
+
+    # Week window as datetimes for rrule.between, computed once for all events
+    start_of_week_datetime = datetime.datetime.combine(start_of_week, datetime.datetime.min.time())
+    end_of_week_datetime = datetime.datetime.combine(end_of_week, datetime.datetime.max.time())
+
+    # Iterate over the events in the calendar, letting walk() do the filtering
+    for event in calendar.walk('VEVENT'):
+        # Decode the start/end once and drop out-of-week one-off events
+        # before any further per-event work
+        event_start = event.decoded('DTSTART')
+        event_end = event.decoded('DTEND')
+        start_date = event_start.date() if isinstance(event_start, datetime.datetime) else event_start
+        end_date = event_end.date() if isinstance(event_end, datetime.datetime) else event_end
+
+        in_week = start_of_week <= start_date <= end_of_week or start_of_week <= end_date <= end_of_week
+        has_rrule = bool(event.get('RRULE'))
+        if not in_week and not has_rrule:
+            continue
+
+        # Regular event
+        if in_week:
+            events_of_week.append(make_event_times(event, event_start, event_end))
+
+        # Recurring event
+        if has_rrule:
+            rrule = event['RRULE'].to_ical().decode('utf-8')
+
+            # Skip expansion when the rule already ended before this week
+            until = event['RRULE'].get('UNTIL')
+            if until:
+                until_value = until[0] if isinstance(until, list) else until
+                if isinstance(until_value, datetime.datetime):
+                    until_value = until_value.date()
+                if until_value < start_of_week - datetime.timedelta(days=1):
+                    continue
+
+            recurring_events = []
+
+            # Create the recurrence rule object from the RRULE string
+            rule = compile_rrule(rrule, start_date.toordinal())
+
+            # Generate the recurring dates within the specified week
+            recurring_dates = rule.between(start_of_week_datetime, end_of_week_datetime, inc=True)
+
+            # Time of day is the same for every occurrence; extract it once
+            event_start_time = event_start
+            if isinstance(event_start_time, datetime.datetime):
+                event_start_time = event_start_time.time()
+            event_end_time = event_end
+            if isinstance(event_end_time, datetime.datetime):
+                event_end_time = event_end_time.time()
+
+            for date in recurring_dates:
+                # Calculate the adjusted start and end times based on the original event's duration.
+                # The occurrence shares the original VEVENT for its properties; only
+                # the times differ, and those live on the EventTimes tuple.
+                new_event_start = datetime.datetime.combine(date, event_start_time)
+                new_event_end = datetime.datetime.combine(date, event_end_time)
+
+                recurring_events.append(make_event_times(event, new_event_start, new_event_end))
+
+            events_of_week.extend(recurring_events)
+
+    dates = [start_of_week + datetime.timedelta(days=i) for i in range(7)]
+
+    # Create a dictionary to store events by date
+    events_by_date = {date: [] for date in dates}
+
+    # Filtering duplicate events: keep the newest version of each UID
+    best_by_uid = {}
+    for times in events_of_week:
+        event_uid = times.vevent.get('UID')
+        existing_event = best_by_uid.get(event_uid)
+
+        if existing_event is None or times.vevent.decoded('LAST-MODIFIED') > existing_event.vevent.decoded(
+                'LAST-MODIFIED'):
+            best_by_uid[event_uid] = times
+
+    # Group events by date, tracking the tallest day along the way
+    rowamount = 0
+    for times in best_by_uid.values():
+        # Filter events if needed
+        if times.vevent.decoded('SUMMARY') != bytes('', 'utf-8'):
+            bucket = events_by_date[times.start_date]
+            bucket.append(times)
+            if len(bucket) > rowamount:
+                rowamount = len(bucket)
+
+    return events_by_date, dates, rowamount
+
+
+# Build the table cell grids for both languages in one pass over the events
+def build_language_cells(events_by_date, dates, rowamount):
+    # Column index per date, instead of a timedelta subtraction per event
+    day_index = {date: index for index, date in enumerate(dates)}
+
+    # Location Filter
+    location_variable = 'Queerreferat an den Aachener Hochschulen e.V., Gerlachstraße 20-22, 52064 Aachen, Deutschland'
+
+    # One grid per language, plus a shared grid remembering each cell's color
+    cells_de = [[''] * 7 for _ in range(rowamount)]
+    cells_en = [[''] * 7 for _ in range(rowamount)]
+    cell_colors = [[None] * 7 for _ in range(rowamount)]
+
+    for date, events in events_by_date.items():
+        k = 0
+
+        # Sort by start time, breaking ties by summary (same ordering the old
+        # adjacent-swap loop produced, but in one Timsort pass)
+        sorted_events = sorted(events, key=lambda item: (item.start_local, str(item.vevent.get("SUMMARY") or "")))
+
+        for times in sorted_events:
+            event = times.vevent
+            # Format event information
+            event_title = event.get('SUMMARY')
+            event_time = f"{times.start_local.strftime('%H:%M')} - {times.end_local.strftime('%H:%M')}"
+            location = event.get('LOCATION', '')
+            event_location = "<br/>" + location if location != location_variable else ''
+            event_description = HTML_STRIP_RE.sub('', event.get('DESCRIPTION', ''))
+            # Split on the first separator: German text before it, English after
+            parts = SEPARATOR_RE.split(event_description, maxsplit=1)
+            description_de = parts[0]
+            description_en = parts[1] if len(parts) > 1 else parts[0]
+
+            # Collect event infos, one Paragraph per language
+            cell_prefix = f"<b>{event_title}</b><br/>{event_time}<i>{event_location}</i><br/>"
+            cell_de = Paragraph(cell_prefix + description_de, CELL_STYLE)
+            cell_en = Paragraph(cell_prefix + description_en, CELL_STYLE)
+
+            # Look up the event color once, at insertion time
+            event_name = str(event_title).strip()
+            color_to_use = EVENT_COLORS.get(event_name) or color_for(event_name)
+
+            col = day_index[times.start_date]
+            cells_de[k][col] = cell_de
+            cells_en[k][col] = cell_en
+            cell_colors[k][col] = color_to_use
+
+            k = k + 1
+
+    return cells_de, cells_en, cell_colors
+
+
+# Assemble and write one language's PDF from the prebuilt cell grid.
+# The header and title are preformatted by the caller (locale is process
+# state and must not be touched from worker threads).
+def render_pdf(cells, cell_colors, header, title_text, rowamount, output_path):
+    events_exist = rowamount >= 1
+
+    columnwidth = 110
+
+    data = [list(header)]
+    data.extend(cells)
+
+    # Create table style from the shared base directives
+    table_style = list(BASE_TABLE_STYLE)
+
+    # Collect merged cell runs with one run-length pass per day column
+    rowheights = 470 / rowamount if rowamount else 470
+    col_runs = []
+    for col_index in range(7):
+        row_index = 1
+        while row_index <= rowamount:
+            if data[row_index][col_index] == '':
+                row_index += 1
+                continue
+            # Extend the run over the empty cells below this event
+            run_end = row_index
+            while run_end + 1 <= rowamount and data[run_end + 1][col_index] == '':
+                run_end += 1
+            col_runs.append((col_index, row_index, run_end, cell_colors[row_index - 1][col_index]))
+            cell_height = (run_end - row_index + 1) * rowheights
+            data[row_index][col_index] = KeepInFrame(columnwidth, cell_height, [data[row_index][col_index]])
+            row_index = run_end + 1
+
+    # Emit the style directives in two batched extends
+    table_style.extend(('SPAN', (c, r0), (c, r1)) for c, r0, r1, _ in col_runs if r1 > r0)
+    table_style.extend(('BACKGROUND', (c, r0), (c, r1), color) for c, r0, r1, color in col_runs)
+
+    elements = []
+
+    # Add title
+    title = Paragraph(title_text, TITLE_STYLE)
+    elements.append(title)
+
+    # Create table
+    if events_exist:
+        # Calculate cell heights based on content
+        row_heights = [cm * 1.5] + [rowheights] * rowamount
+        table = Table(data, colWidths=columnwidth, rowHeights=row_heights)
+        table.setStyle(TableStyle(table_style))
+        elements.append(table)
+    else:
+        msg_text = "Diese Woche keine Veranstaltungen<br/><i>No events this week</i>"
+        msg = Paragraph(msg_text, MSG_STYLE)
+        elements.append(Spacer(1, 2 * cm))
+        elements.append(msg)
+
+    # Create the PDF file through a buffered handle, compressing page streams
+    with open(output_path, 'wb', buffering=1 << 20) as output_file:
+        doc = SimpleDocTemplate(output_file, pagesize=landscape(A4), pageCompression=1,
+                                leftMargin=(6.35 * mm), rightMargin=(6.35 * mm),
+                                topMargin=(6.35 * mm),
+                                bottomMargin=(6.35 * mm))
+
+        # Build the document with the elements
+        doc.build(elements)
+
+    print(f'Event overview table generated: {output_path}')
+
+
+# Pick a non-clashing output path with a single directory scan
+def unique_output_path(directory, filename):
+    output_path = os.path.join(directory, filename)
+    if not os.path.exists(output_path):
+        return output_path
+    base_name, extension = os.path.splitext(filename)
+    suffix_re = re.compile(rf"{re.escape(base_name)}\((\d+)\){re.escape(extension)}$")
+    max_suffix = 0
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            match = suffix_re.match(entry.name)
+            if match:
+                max_suffix = max(max_suffix, int(match.group(1)))
+    return os.path.join(directory, f"{base_name}({max_suffix + 1}){extension}")
+
+
+# iCal feed of the Queerreferat calendar
+ICAL_URL = 'https://calendar.google.com/calendar/ical/queerreferat.aachen%40gmail.com/public/basic.ics'
+
+# Remember the last generation so repeated calls for the same week can be skipped
+_LAST_RUN = {"week": None, "url": None, "paths": (None, None)}
+
+
+# Generate the German and English overview PDFs for the current week
+def generate_overview(ical_url=ICAL_URL, current_date=None):
+    if current_date is None:
+        current_date = datetime.datetime.now().date()
+
+    # Skip regeneration when the week and feed are unchanged since the last run
+    week_key = (current_date.isocalendar()[0], current_date.isocalendar()[1])
+    if (week_key, ical_url) == (_LAST_RUN["week"], _LAST_RUN["url"]) and all(
+            path is not None and os.path.exists(path) for path in _LAST_RUN["paths"]):
+        for path in _LAST_RUN["paths"]:
+            print(f'Event overview table generated: {path}')
+        return list(_LAST_RUN["paths"])
+
+    # Output directory and name
+    current_directory = os.getcwd()
+    current_week = current_date.strftime('%Y-%W')
+
+    # Fetch data from the iCal URL once for both languages
+    calendar = fetch_calendar(ical_url)
+    if calendar is None:
+        print('Failed to fetch iCal data.')
+        return None
+
+    # Collect the events of the week and build the cell grids once for both languages
+    events_by_date, dates, rowamount = collect_events(calendar, current_date)
+    if rowamount:
+        cells_de, cells_en, cell_colors = build_language_cells(events_by_date, dates, rowamount)
+    else:
+        # Quiet week: skip the cell work, render_pdf emits the no-events message
+        cells_de = cells_en = []
+        cell_colors = []
+
+    # Format the locale-dependent strings sequentially, then build the two PDFs in parallel
+    output_paths = []
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = []
+        for t in range(2):
+
+            # Define the output directory and filename
+            if t == 0:
+                try:
+                    locale.setlocale(locale.LC_TIME, 'de_DE.utf8')
+                except locale.Error:
+                    print("Unsupported locale setting, using default locale.")
+                output_filename = f'event_overview_{current_week}_de.pdf'
+            else:
+                try:
+                    locale.setlocale(locale.LC_TIME, 'en_US.utf8')
+                except locale.Error:
+                    print("Unsupported locale setting, using default locale.")
+                output_filename = f'event_overview_{current_week}_en.pdf'
+
+            # Append an ascending suffix if the output file already exists
+            output_path = unique_output_path(current_directory, output_filename)
+
+            # Prepare column Headers and title under the current locale
+            header = [date.strftime('%A\n%d %b') for date in dates]
+            if t == 0:
+                title_text = f"Veranstaltungen der Woche vom {dates[0].strftime('%d %b %Y')} bis {dates[-1].strftime('%d %b %Y')}"
+            else:
+                title_text = f"<i>Events of the week from {dates[0].strftime('%d %b %Y')} to {dates[-1].strftime('%d %b %Y')}</i>"
+
+            output_paths.append(output_path)
+            futures.append(executor.submit(render_pdf, cells_de if t == 0 else cells_en, cell_colors,
+                                           header, title_text, rowamount, output_path))
+
+        for future in futures:
+            future.result()
+
+    _LAST_RUN["week"] = week_key
+    _LAST_RUN["url"] = ical_url
+    _LAST_RUN["paths"] = tuple(output_paths)
+    return output_paths
+
+
+if __name__ == '__main__':
+    generate_overview()